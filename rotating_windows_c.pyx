@@ -0,0 +1,123 @@
+# rotating_windows_c.pyx
+# cython: language_level=3, boundscheck=False, wraparound=False, cdivision=True
+"""
+Cython port of the RotatingOwnershipWindows per-send state machine.
+
+All per-party and claim state lives in typed int memoryviews, so
+send()/party_can_send() compile down to C array arithmetic; the only
+remaining Python overhead is the call into the extension itself. The
+pure-Python class in rotating_windows_protocol stays the reference
+oracle — both must produce identical pad-index sequences.
+
+Build with: python setup.py build_ext --inplace
+"""
+import array
+
+from cpython cimport array
+
+
+cdef class RotatingOwnershipWindowsC:
+
+    cdef readonly int n, m, w, g, stride, num_windows
+    cdef int[::1] next_rr, cur_window, offset, claimed_by
+    cdef long next_unclaimed
+    cdef long _used_count
+
+    def __init__(self, int n, int m, int w, int g=0):
+        if n <= 0:
+            raise ValueError("n must be positive")
+        if m < 2:
+            raise ValueError("m must be >= 2")
+        if w <= 0:
+            raise ValueError("w must be positive")
+        if g < 0:
+            raise ValueError("g must be >= 0")
+
+        self.n = n
+        self.m = m
+        self.w = w
+        self.g = g
+        self.stride = w + g
+        self.num_windows = n // self.stride
+
+        self.next_rr = array.array("i", range(m))
+        self.cur_window = array.array("i", [-1] * m)
+        self.offset = array.array("i", [0] * m)
+        self.claimed_by = array.array("i", [-1] * self.num_windows)
+        self.next_unclaimed = 0
+        self._used_count = 0
+
+    cdef long _claim_window(self, int pid) noexcept:
+        """
+        Same preference order as the Python class: the party's RR slot
+        first, then the lowest unclaimed window. Maintains the invariant
+        that next_unclaimed always points at the lowest unclaimed window.
+        Returns the claimed window index or -1 if none remain.
+        """
+        cdef long rr = self.next_rr[pid]
+        cdef long b, nu
+
+        if rr < self.num_windows and self.claimed_by[rr] == -1:
+            self.claimed_by[rr] = pid
+            self.cur_window[pid] = <int>rr
+            self.offset[pid] = 0
+            self.next_rr[pid] = <int>(rr + self.m)
+            if rr == self.next_unclaimed:
+                nu = rr + 1
+                while nu < self.num_windows and self.claimed_by[nu] != -1:
+                    nu += 1
+                self.next_unclaimed = nu
+            return rr
+
+        if rr < self.num_windows:
+            self.next_rr[pid] = <int>(rr + self.m)
+
+        b = self.next_unclaimed
+        if b >= self.num_windows:
+            return -1
+
+        self.claimed_by[b] = pid
+        self.cur_window[pid] = <int>b
+        self.offset[pid] = 0
+        nu = b + 1
+        while nu < self.num_windows and self.claimed_by[nu] != -1:
+            nu += 1
+        self.next_unclaimed = nu
+        return b
+
+    cpdef bint party_can_send(self, int pid):
+        if self.cur_window[pid] != -1 and self.offset[pid] < self.w:
+            return True
+        cdef long rr = self.next_rr[pid]
+        if rr < self.num_windows and self.claimed_by[rr] == -1:
+            return True
+        return self.next_unclaimed < self.num_windows
+
+    cpdef long send(self, int pid) except -1:
+        """
+        Consume exactly 1 pad index owned by pid and return it.
+        Equivalent to the Python class's send_fast().
+        """
+        cdef long b = self.cur_window[pid]
+        if b == -1 or self.offset[pid] >= self.w:
+            b = self._claim_window(pid)
+            if b == -1:
+                raise RuntimeError(f"Party {pid} cannot send: no windows left to claim")
+
+        cdef long pad_index = 1 + b * self.stride + self.offset[pid]
+
+        self.offset[pid] += 1
+        if self.offset[pid] >= self.w:
+            self.cur_window[pid] = -1
+        self._used_count += 1
+
+        return pad_index
+
+    cpdef long pads_used(self):
+        return self._used_count
+
+    cpdef long wasted_pads(self):
+        return self.n - self._used_count
+
+    cpdef long total_remaining(self):
+        return self.num_windows * self.w - self._used_count
@@ -1,26 +1,38 @@
 # rotating_windows_protocol.py
 from __future__ import annotations
-from dataclasses import dataclass
-from typing import Dict, List, Optional, Set, Tuple
+import array
+from typing import Final, Optional
+
+try:
+    import numpy as np
+    _HAVE_NUMPY = True
+except ImportError:
+    _HAVE_NUMPY = False
 
 
-@dataclass(frozen=True)
 class Message:
-    sender: int
-    pad_index: int
-    payload: bytes
+    __slots__ = ("sender", "pad_index", "payload")
 
+    def __init__(self, sender: int, pad_index: int, payload: bytes):
+        self.sender = sender
+        self.pad_index = pad_index
+        self.payload = payload
 
-@dataclass(frozen=True)
-class Window:
-    start: int  # inclusive, 1-indexed
-    end: int    # inclusive
+    def __repr__(self) -> str:
+        return f"Message(sender={self.sender}, pad_index={self.pad_index}, payload={self.payload!r})"
 
 
 class RotatingOwnershipWindows:
 
+    # No per-instance __dict__: attribute access is a slot load, and the
+    # 900 instances a full sweep creates stay small.
+    __slots__ = (
+        "n", "m", "w", "g", "stride", "num_windows", "_win_starts",
+        "next_rr", "cur_window", "offset", "claimed_by", "next_unclaimed",
+        "debug", "_used_bits", "_used_count",
+    )
 
-    def __init__(self, n: int, m: int, w: int, g: int = 0):
+    def __init__(self, n: int, m: int, w: int, g: int = 0, debug: bool = False):
         if n <= 0:
             raise ValueError("n must be positive")
         if m < 2:
@@ -30,40 +42,55 @@ class RotatingOwnershipWindows:
         if g < 0:
             raise ValueError("g must be >= 0")
 
-        self.n = n
-        self.m = m
-        self.w = w
-        self.g = g
-        self.stride = w + g
-
-        # Number of full windows (only full windows)
-        self.num_windows = n // self.stride
-        self.windows: List[Window] = []
-        for b in range(self.num_windows):
-            start = 1 + b * self.stride
-            end = start + w - 1
-            self.windows.append(Window(start, end))
-
-        # ---- Party state ----
-        # next preferred RR window index per party
-        self.next_rr: Dict[int, int] = {pid: pid for pid in range(m)}
-        # current window that pid has claimed and is consuming
-        self.cur_window: Dict[int, Optional[int]] = {pid: None for pid in range(m)}
-        # offset inside current window [0..w-1]
-        self.offset: Dict[int, int] = {pid: 0 for pid in range(m)}
+        self.n: Final[int] = n
+        self.m: Final[int] = m
+        self.w: Final[int] = w
+        self.g: Final[int] = g
+        self.stride: Final[int] = w + g
+
+        # Number of full windows (only full windows); starts are precomputed
+        # so the per-send pad index is one table load plus an add.
+        self.num_windows: Final[int] = n // self.stride
+
+        # All state is scalar-indexed flat int arrays, so array.array (same
+        # contiguous C-int layout) works as a drop-in when numpy is absent.
+        if _HAVE_NUMPY:
+            self._win_starts = 1 + np.arange(self.num_windows, dtype=np.int64) * self.stride
+        else:
+            self._win_starts = array.array("q", (1 + b * self.stride for b in range(self.num_windows)))
+
+        # ---- Party state (SoA: one array per field, indexed by pid) ----
+        if _HAVE_NUMPY:
+            # next preferred RR window index per party
+            self.next_rr = np.arange(m, dtype=np.int32)
+            # current window that pid has claimed and is consuming (-1 = none)
+            self.cur_window = np.full(m, -1, dtype=np.int32)
+            # offset inside current window [0..w-1]
+            self.offset = np.zeros(m, dtype=np.int32)
+        else:
+            self.next_rr = array.array("i", range(m))
+            self.cur_window = array.array("i", [-1] * m)
+            self.offset = array.array("i", [0] * m)
 
         # ---- Global claim state ----
         # claimed_by[b] = pid if claimed else -1
-        self.claimed_by: List[int] = [-1] * self.num_windows
+        if _HAVE_NUMPY:
+            self.claimed_by = np.full(self.num_windows, -1, dtype=np.int32)
+        else:
+            self.claimed_by = array.array("i", [-1] * self.num_windows)
         # pointer to next globally unclaimed window (for fast reclaim)
         self.next_unclaimed: int = 0
 
-        # For correctness checking
-        self.used_pads: Set[int] = set()
-
-    def _advance_next_unclaimed(self) -> None:
-        while self.next_unclaimed < self.num_windows and self.claimed_by[self.next_unclaimed] != -1:
-            self.next_unclaimed += 1
+        # The RR+reclaim logic already guarantees pad uniqueness; the bitset
+        # reuse check is redundant and only enabled for debugging.
+        self.debug: Final[bool] = debug
+        if debug:
+            # Bitset over pad indices (1-indexed, so bit n must fit).
+            size = (n >> 3) + 1
+            self._used_bits = np.zeros(size, dtype=np.uint8) if _HAVE_NUMPY else bytearray(size)
+        else:
+            self._used_bits = None
+        self._used_count: int = 0
 
     def _claim_window(self, pid: int) -> Optional[int]:
         """
@@ -72,6 +99,10 @@ class RotatingOwnershipWindows:
           1) pid's next_rr window if available and unclaimed
           2) next globally unclaimed window (reclaim)
         Returns claimed window index or None if none left.
+
+        Invariant maintained here: next_unclaimed always points at the
+        lowest unclaimed window (or num_windows when none remain), so no
+        caller ever needs to scan claimed_by.
         """
         # 1) Try preferred RR window
         rr = self.next_rr[pid]
@@ -80,6 +111,13 @@ class RotatingOwnershipWindows:
             self.cur_window[pid] = rr
             self.offset[pid] = 0
             self.next_rr[pid] += self.m
+            # Only an RR claim landing exactly on next_unclaimed can break
+            # the invariant; everything below the pointer is already claimed.
+            if rr == self.next_unclaimed:
+                nu = rr + 1
+                while nu < self.num_windows and self.claimed_by[nu] != -1:
+                    nu += 1
+                self.next_unclaimed = nu
             return rr
 
         # Even if rr is already claimed or out of range, we still advance RR pointer
@@ -88,15 +126,17 @@ class RotatingOwnershipWindows:
             self.next_rr[pid] += self.m
 
         # 2) Reclaim next globally unclaimed window
-        self._advance_next_unclaimed()
-        if self.next_unclaimed >= self.num_windows:
+        b = self.next_unclaimed
+        if b >= self.num_windows:
             return None
 
-        b = self.next_unclaimed
         self.claimed_by[b] = pid
         self.cur_window[pid] = b
         self.offset[pid] = 0
-        self.next_unclaimed += 1  # move forward (will be cleaned by _advance_next_unclaimed when needed)
+        nu = b + 1
+        while nu < self.num_windows and self.claimed_by[nu] != -1:
+            nu += 1
+        self.next_unclaimed = nu
         return b
 
     def party_can_send(self, pid: int) -> bool:
@@ -104,65 +144,99 @@ class RotatingOwnershipWindows:
         Party can send if it either has a current window with remaining pads,
         or can claim a new window.
         """
-        b = self.cur_window[pid]
-        if b is not None and self.offset[pid] < self.w:
+        if self.cur_window[pid] != -1 and self.offset[pid] < self.w:
             return True
 
         # If no current window or window exhausted, see if any window remains claimable
         # (We do not permanently mutate state here; claim happens in send()).
-        # Quick check: if there exists any unclaimed window or rr is unclaimed.
         rr = self.next_rr[pid]
         if rr < self.num_windows and self.claimed_by[rr] == -1:
             return True
-        # Or global unclaimed remains
-        # We won't scan; use next_unclaimed pointer
-        tmp = self.next_unclaimed
-        while tmp < self.num_windows and self.claimed_by[tmp] != -1:
-            tmp += 1
-        return tmp < self.num_windows
+        # _claim_window re-advances next_unclaimed after every claim, so it
+        # always points at the lowest unclaimed window; no scan needed here.
+        return self.next_unclaimed < self.num_windows
 
     def _current_pad_index(self, pid: int) -> int:
         b = self.cur_window[pid]
-        if b is None:
+        if b == -1:
             raise RuntimeError("Party has no current window")
-        win = self.windows[b]
-        return win.start + self.offset[pid]
+        return int(self._win_starts[b] + self.offset[pid])
 
-    def send(self, pid: int, payload: bytes) -> Message:
+    def send_fast(self, pid: int) -> int:
         """
-        Consume exactly 1 pad index owned by pid and emit a broadcast message.
+        Consume exactly 1 pad index owned by pid and return it, without
+        materializing a Message. This is the hot path for simulations.
         """
         # If no current window or exhausted, claim a new one
-        if self.cur_window[pid] is None or self.offset[pid] >= self.w:
+        if self.cur_window[pid] == -1 or self.offset[pid] >= self.w:
             claimed = self._claim_window(pid)
             if claimed is None:
                 raise RuntimeError(f"Party {pid} cannot send: no windows left to claim")
 
         pad_index = self._current_pad_index(pid)
 
-        # Correctness check: no pad reuse
-        if pad_index in self.used_pads:
-            raise RuntimeError(f"Pad reuse detected: pad_index={pad_index}")
-        self.used_pads.add(pad_index)
+        # Correctness check: no pad reuse (bit-test + bit-set, no hashing)
+        if self.debug:
+            byte, mask = pad_index >> 3, 1 << (pad_index & 7)
+            if self._used_bits[byte] & mask:
+                raise RuntimeError(f"Pad reuse detected: pad_index={pad_index}")
+            self._used_bits[byte] |= mask
+        self._used_count += 1
 
         # Advance within window
         self.offset[pid] += 1
         if self.offset[pid] >= self.w:
             # mark current window exhausted; next send will claim a new one
-            self.cur_window[pid] = None
+            self.cur_window[pid] = -1
+
+        return pad_index
 
-        return Message(sender=pid, pad_index=pad_index, payload=payload)
+    def send(self, pid: int, payload: bytes) -> Message:
+        """
+        Consume exactly 1 pad index owned by pid and emit a broadcast message.
+        """
+        return Message(sender=pid, pad_index=self.send_fast(pid), payload=payload)
 
     def deliver(self, msg: Message) -> None:
         # Delivery doesn't affect ownership in this protocol.
         return
 
     def pads_used(self) -> int:
-        return len(self.used_pads)
+        return self._used_count
+
+    def verify(self) -> None:
+        """
+        Reconstruct the used-pad count from claim state and check it against
+        the running counter. Windows are disjoint by construction, so every
+        claimed window contributes w pads if exhausted, or offset[owner] pads
+        if it is the owner's current window.
+        """
+        used = 0
+        for b in range(self.num_windows):
+            pid = self.claimed_by[b]
+            if pid == -1:
+                continue
+            if self.cur_window[pid] == b:
+                used += int(self.offset[pid])
+            else:
+                used += self.w
+        if used != self._used_count:
+            raise RuntimeError(
+                f"Pad accounting mismatch: reconstructed {used}, counted {self._used_count}"
+            )
 
     def wasted_pads(self) -> int:
         return self.n - self.pads_used()
 
+    def total_remaining(self) -> int:
+        """
+        Pads still consumable across all parties: window capacity minus pads
+        used. Claims are monotonic, so once this hits 0 no party can ever
+        send again and simulations can stop immediately instead of waiting
+        for the random sender choice to land on a blocked party.
+        """
+        return self.num_windows * self.w - self._used_count
+
     def protocol_capacity_in_messages(self) -> int:
         # Total pads inside windows (gaps/tail excluded)
         return self.num_windows * self.w
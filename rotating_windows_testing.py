@@ -1,10 +1,19 @@
 # rotating_windows_testing.py
 from __future__ import annotations
+import multiprocessing
 import random
 from dataclasses import dataclass
 from typing import Dict, List, Optional, Tuple
 
-from rotating_windows_protocol import RotatingOwnershipWindows, Message
+import numpy as np
+
+try:
+    from numba import njit
+    _HAVE_NUMBA = True
+except ImportError:
+    _HAVE_NUMBA = False
+
+from rotating_windows_protocol import RotatingOwnershipWindows
 
 
 @dataclass
@@ -20,72 +29,191 @@ class SimConfig:
 
 
 def pick_active_parties(m: int, x: int, rng: random.Random) -> List[int]:
-    return rng.sample(list(range(m)), k=x)
-
-
-def maybe_deliver_some(pending: List[Message], proto: RotatingOwnershipWindows, rng: random.Random, deliver_prob: float):
-    if not pending:
-        return
-    if rng.random() > deliver_prob:
-        return
+    # range objects are sampleable directly; no need to materialize a list.
+    return rng.sample(range(m), k=x)
+
+
+def deliver_some(pending_count: int, rng: np.random.Generator) -> int:
+    """
+    Deliver a random batch of up to half of the pending messages and return
+    the new count. deliver() is a no-op in this protocol, so only the count
+    matters; the caller decides whether delivery happens at all.
+    """
+    k = int(rng.integers(1, max(1, pending_count // 2) + 1))
+    return pending_count - min(k, pending_count)
+
+
+def _simulate(n: int, m: int, w: int, g: int, d: int, deliver_prob: float,
+              max_steps: int, active: np.ndarray, seed: int) -> Tuple[int, int, int]:
+    """
+    Jitted equivalent of the pure-Python execution loop. Owns all protocol
+    state as flat int32 arrays and skips payload construction entirely;
+    delivery only matters through the pending count, so messages are not
+    materialized. Returns (used, wasted, steps).
+    """
+    np.random.seed(seed)
+
+    stride = w + g
+    num_windows = n // stride
+    next_rr = np.arange(m).astype(np.int32)
+    cur_window = np.full(m, -1, dtype=np.int32)
+    offset = np.zeros(m, dtype=np.int32)
+    claimed_by = np.full(num_windows, -1, dtype=np.int32)
+    next_unclaimed = 0
+
+    used = 0
+    pending = 0
+    num_active = active.shape[0]
+    capacity = num_windows * w
 
-    k = rng.randint(1, max(1, len(pending) // 2))
-    for _ in range(k):
-        if not pending:
+    steps = 0
+    while steps < max_steps:
+        # Nothing left anywhere: no need to wait for a blocked sender draw.
+        if used >= capacity:
             break
-        idx = rng.randrange(len(pending))
-        msg = pending.pop(idx)
-        proto.deliver(msg)
+        steps += 1
+
+        # Enforce <= d undelivered (forced delivery)
+        if pending >= d:
+            hi = max(1, pending // 2)
+            k = np.random.randint(1, hi + 1)
+            pending -= min(k, pending)
+
+        if pending > 0 and np.random.random() <= deliver_prob:
+            hi = max(1, pending // 2)
+            k = np.random.randint(1, hi + 1)
+            pending -= min(k, pending)
+
+        sender = active[np.random.randint(0, num_active)]
+
+        if cur_window[sender] == -1 or offset[sender] >= w:
+            # Claim a new window: preferred RR slot first, then reclaim.
+            rr = next_rr[sender]
+            claimed = -1
+            if rr < num_windows and claimed_by[rr] == -1:
+                claimed = rr
+                next_rr[sender] = rr + m
+            else:
+                if rr < num_windows:
+                    next_rr[sender] = rr + m
+                while next_unclaimed < num_windows and claimed_by[next_unclaimed] != -1:
+                    next_unclaimed += 1
+                if next_unclaimed < num_windows:
+                    claimed = next_unclaimed
+                    next_unclaimed += 1
+            if claimed == -1:
+                break  # sender cannot send: no windows left
+            claimed_by[claimed] = sender
+            cur_window[sender] = claimed
+            offset[sender] = 0
+
+        used += 1
+        offset[sender] += 1
+        if offset[sender] >= w:
+            cur_window[sender] = -1
+        pending += 1
+
+    return used, n - used, steps
+
+
+if _HAVE_NUMBA:
+    _simulate = njit(cache=True)(_simulate)
 
 
 def run_one_execution(cfg: SimConfig, active: List[int], seed: Optional[int] = None) -> Tuple[int, int, int]:
-    rng = random.Random(seed)
+    if _HAVE_NUMBA:
+        if seed is None:
+            seed = random.getrandbits(32)
+        used, wasted, steps = _simulate(
+            cfg.n, cfg.m, cfg.w, cfg.g, cfg.d, cfg.deliver_prob, cfg.max_steps,
+            np.asarray(active, dtype=np.int64), seed & 0xFFFFFFFF,
+        )
+        return int(used), int(wasted), int(steps)
+    return _run_one_execution_py(cfg, active, seed)
+
+
+_RNG_BATCH = 4096
+
+
+def _run_one_execution_py(cfg: SimConfig, active: List[int], seed: Optional[int] = None) -> Tuple[int, int, int]:
+    rng = np.random.default_rng(seed)
     proto = RotatingOwnershipWindows(n=cfg.n, m=cfg.m, w=cfg.w, g=cfg.g)
-    pending: List[Message] = []
+    # Delivery never touches protocol state, so pending messages reduce to a
+    # count — no Message allocation or list churn per step.
+    pending_count = 0
+
+    # Bind hot attributes to locals: one LOAD_FAST instead of a dict probe
+    # per call in a loop that runs up to max_steps times.
+    party_can_send = proto.party_can_send
+    send_fast = proto.send_fast
+    total_remaining = proto.total_remaining
+    d = cfg.d
+    deliver_prob = cfg.deliver_prob
+    max_steps = cfg.max_steps
+
+    # Pre-draw sender picks and delivery rolls in blocks: one vector draw
+    # per _RNG_BATCH steps instead of two Python-level RNG calls per step.
+    num_active = len(active)
+    senders = rng.integers(0, num_active, size=_RNG_BATCH)
+    rolls = rng.random(_RNG_BATCH)
+    cursor = _RNG_BATCH
 
     steps = 0
-    while steps < cfg.max_steps:
+    while steps < max_steps:
+        # Nothing left anywhere: no need to wait for a blocked sender draw.
+        if total_remaining() == 0:
+            break
         steps += 1
 
-        # Enforce <= d undelivered
-        if len(pending) >= cfg.d:
-            maybe_deliver_some(pending, proto, rng, deliver_prob=1.0)
+        if cursor == _RNG_BATCH:
+            senders = rng.integers(0, num_active, size=_RNG_BATCH)
+            rolls = rng.random(_RNG_BATCH)
+            cursor = 0
+
+        # Enforce <= d undelivered (forced delivery)
+        if pending_count >= d:
+            pending_count = deliver_some(pending_count, rng)
 
-        maybe_deliver_some(pending, proto, rng, cfg.deliver_prob)
+        if pending_count and rolls[cursor] <= deliver_prob:
+            pending_count = deliver_some(pending_count, rng)
 
-        sender = rng.choice(active)
-        if not proto.party_can_send(sender):
+        sender = active[senders[cursor]]
+        cursor += 1
+        if not party_can_send(sender):
             break
 
-        payload = bytes(rng.getrandbits(8) for _ in range(cfg.payload_len))
-        msg = proto.send(sender, payload)
-        pending.append(msg)
+        send_fast(sender)
+        pending_count += 1
 
     return proto.pads_used(), proto.wasted_pads(), steps
 
 
-def run_trials(cfg: SimConfig, x: int, trials: int, seed: int = 1234) -> Dict[str, float]:
+def run_trials(cfg: SimConfig, x: int, trials: int, seed: int = 1234,
+               workers: Optional[int] = None) -> Dict[str, float]:
+    # Trials are independent given their seeds, so fan them out over a
+    # process pool. Active sets and per-trial seeds are drawn in the master
+    # from one seeded RNG, keeping results reproducible regardless of how
+    # trials land on workers.
     rng = random.Random(seed)
-    wastes: List[int] = []
-    useds: List[int] = []
-    steps_list: List[int] = []
+    jobs = [(cfg, pick_active_parties(cfg.m, x, rng), rng.getrandbits(64))
+            for _ in range(trials)]
+
+    with multiprocessing.Pool(processes=workers) as pool:
+        results = np.asarray(pool.starmap(run_one_execution, jobs), dtype=np.int64)
 
-    for _ in range(trials):
-        active = pick_active_parties(cfg.m, x, rng)
-        used, wasted, steps = run_one_execution(cfg, active, seed=rng.getrandbits(64))
-        wastes.append(wasted)
-        useds.append(used)
-        steps_list.append(steps)
+    useds = results[:, 0]
+    wastes = results[:, 1]
+    steps_list = results[:, 2]
 
     return {
         "m": cfg.m,
         "x": x,
         "trials": trials,
-        "avg_wasted": sum(wastes) / trials,
-        "min_wasted": min(wastes),
-        "max_wasted": max(wastes),
-        "avg_used": sum(useds) / trials,
-        "avg_steps": sum(steps_list) / trials,
+        "avg_wasted": float(wastes.mean()),
+        "min_wasted": int(wastes.min()),
+        "max_wasted": int(wastes.max()),
+        "avg_used": float(useds.mean()),
+        "avg_steps": float(steps_list.mean()),
     }
 
 
@@ -0,0 +1,9 @@
+# setup.py — builds the optional Cython protocol extension:
+#   python setup.py build_ext --inplace
+from setuptools import setup
+from Cython.Build import cythonize
+
+setup(
+    name="rotating-windows",
+    ext_modules=cythonize("rotating_windows_c.pyx"),
+)